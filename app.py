@@ -3,6 +3,8 @@
 
 import os
 import json
+import gzip
+import hashlib
 from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo
 
@@ -12,6 +14,7 @@ from flask import (
 )
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text, inspect
+import click
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 INSTANCE_PATH = os.path.join(BASE_DIR, "instance")
@@ -99,6 +102,24 @@ class Orcamento(db.Model):
     itens = db.Column(db.Text, default="[]")  # JSON: [{codigo, nome, qtd, valor_unit, subtotal}]
     total = db.Column(db.Float, default=0.0)
 
+# >>> ARQUIVO MORTO: resumo de cada mês movido para segmento comprimido <<<
+class ArquivoMes(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    mes = db.Column(db.String(7), unique=True, nullable=False)  # YYYY-MM
+    sha256 = db.Column(db.String(64), nullable=False)
+    qtd_vendas = db.Column(db.Integer, default=0)
+    qtd_lancamentos = db.Column(db.Integer, default=0)
+    total_vendas = db.Column(db.Float, default=0.0)
+    total_entradas = db.Column(db.Float, default=0.0)
+    total_saidas = db.Column(db.Float, default=0.0)
+    dias = db.Column(db.Text, default="{}")  # JSON: {"YYYY-MM-DD": {vendas, entradas, saidas}}
+    criado_em = db.Column(db.String(19))
+
+class ArquivoSegmento(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    mes = db.Column(db.String(7), unique=True, nullable=False)  # YYYY-MM
+    dados = db.Column(db.LargeBinary, nullable=False)  # JSONL (venda + lancamento) comprimido com gzip
+
 # --------------- MIGRAÇÃO LEVE ---------------
 def ensure_schema():
     db.create_all()
@@ -346,13 +367,15 @@ def movimentacoes():
     vendas = Venda.query.filter_by(data=d).all()
     entradas = Lancamento.query.filter_by(data=d, tipo="entrada").all()
     saidas = Lancamento.query.filter_by(data=d, tipo="saida").all()
-    total_vendas = sum(v.total for v in vendas)
-    total_entradas = sum(l.valor for l in entradas)
-    total_saidas = sum(l.valor for l in saidas)
+    arq = _resumo_arquivado([d[:7]]).get(d)
+    total_vendas = sum(v.total for v in vendas) + (arq["vendas"] if arq else 0.0)
+    total_entradas = sum(l.valor for l in entradas) + (arq["entradas"] if arq else 0.0)
+    total_saidas = sum(l.valor for l in saidas) + (arq["saidas"] if arq else 0.0)
     return render_template(
         "movimentacoes.html",
         data=d, vendas=vendas, entradas=entradas, saidas=saidas,
-        total_vendas=total_vendas, total_entradas=total_entradas, total_saidas=total_saidas
+        total_vendas=total_vendas, total_entradas=total_entradas, total_saidas=total_saidas,
+        arquivado=bool(arq)
     )
 
 @app.route("/movimentacoes/nova", methods=["POST"])
@@ -422,13 +445,15 @@ def reabrir_caixa():
 @login_required
 def caixas_anteriores():
     caixas = Caixa.query.order_by(Caixa.data.desc()).all()
+    arq = _resumo_arquivado()
     resultado = []
     for c in caixas:
+        a = arq.get(c.data, _ZERO)
         vendas = Venda.query.filter_by(data=c.data).all()
-        total_vendas = sum(v.total for v in vendas)
+        total_vendas = sum(v.total for v in vendas) + a["vendas"]
         lancs = Lancamento.query.filter_by(data=c.data).all()
-        total_ent = sum(l.valor for l in lancs if l.tipo == "entrada")
-        total_des = sum(l.valor for l in lancs if l.tipo == "saida")
+        total_ent = sum(l.valor for l in lancs if l.tipo == "entrada") + a["entradas"]
+        total_des = sum(l.valor for l in lancs if l.tipo == "saida") + a["saidas"]
         saldo_final = (c.saldo_inicial or 0.0) + total_vendas + total_ent - total_des
         resultado.append({
             "data": c.data, "inicial": c.saldo_inicial or 0.0,
@@ -448,12 +473,14 @@ def _range_datas(periodo: str):
 
 def _coleta(ini: date, fim: date):
     d = ini; entrou = saiu = vendas_total = 0.0
+    arq = _resumo_arquivado({(ini + timedelta(days=i)).strftime("%Y-%m") for i in range((fim - ini).days + 1)})
     while d <= fim:
         ds = d.strftime("%Y-%m-%d")
-        vendas_total += sum(v.total for v in Venda.query.filter_by(data=ds).all())
+        a = arq.get(ds, _ZERO)
+        vendas_total += sum(v.total for v in Venda.query.filter_by(data=ds).all()) + a["vendas"]
         lancs = Lancamento.query.filter_by(data=ds).all()
-        entrou += sum(l.valor for l in lancs if l.tipo == "entrada")
-        saiu += sum(l.valor for l in lancs if l.tipo == "saida")
+        entrou += sum(l.valor for l in lancs if l.tipo == "entrada") + a["entradas"]
+        saiu += sum(l.valor for l in lancs if l.tipo == "saida") + a["saidas"]
         d += timedelta(days=1)
     lucro = (vendas_total + entrou) - saiu
     return entrou, saiu, vendas_total, lucro
@@ -462,16 +489,17 @@ def _coleta(ini: date, fim: date):
 @login_required
 def relatorios():
     caixas = Caixa.query.all()
+    arq = _resumo_arquivado()
     saldo_inicial = sum(c.saldo_inicial or 0 for c in caixas)
-    total_vendas = sum(sum(v.total for v in Venda.query.filter_by(data=c.data)) for c in caixas)
-    total_despesas = sum(sum(l.valor for l in Lancamento.query.filter_by(data=c.data) if l.tipo == "saida") for c in caixas)
+    total_vendas = sum(sum(v.total for v in Venda.query.filter_by(data=c.data)) + arq.get(c.data, _ZERO)["vendas"] for c in caixas)
+    total_despesas = sum(sum(l.valor for l in Lancamento.query.filter_by(data=c.data) if l.tipo == "saida") + arq.get(c.data, _ZERO)["saidas"] for c in caixas)
     saldo_final = saldo_inicial + total_vendas - total_despesas
     meses = sorted(set((c.data or "")[:7] for c in caixas if c.data))
     comparativo = []
     for mes in meses:
         cx_mes = [c for c in caixas if (c.data or "").startswith(mes)]
-        vendas_mes = sum(sum(v.total for v in Venda.query.filter_by(data=c.data)) for c in cx_mes)
-        desp_mes = sum(sum(l.valor for l in Lancamento.query.filter_by(data=c.data) if l.tipo == "saida") for c in cx_mes)
+        vendas_mes = sum(sum(v.total for v in Venda.query.filter_by(data=c.data)) + arq.get(c.data, _ZERO)["vendas"] for c in cx_mes)
+        desp_mes = sum(sum(l.valor for l in Lancamento.query.filter_by(data=c.data) if l.tipo == "saida") + arq.get(c.data, _ZERO)["saidas"] for c in cx_mes)
         comparativo.append({"mes": mes, "vendas": f"{vendas_mes:.2f}", "despesas": f"{desp_mes:.2f}", "lucro": f"{(vendas_mes-desp_mes):.2f}"})
     return render_template(
         "relatorios.html",
@@ -568,6 +596,168 @@ def orcamento_imprimir(oid):
         itens = []
     return render_template("orcamento_print.html", o=o, itens=itens)
 
+# ---------------- ARQUIVO MORTO ----------------
+# Meses encerrados saem de Venda/Lancamento para um segmento gzip-JSONL imutável
+# (ArquivoSegmento, fica no banco e entra nos backups); o resumo por dia fica em
+# ArquivoMes e os relatórios somam esse resumo às tabelas vivas.
+# No Postgres o DELETE não devolve espaço: depois de arquivar, rodar
+# VACUUM FULL venda, lancamento; senão o banco cresce pelo tamanho do segmento.
+_ZERO = {"vendas": 0.0, "entradas": 0.0, "saidas": 0.0}
+
+def _valida_mes(mes: str):
+    try:
+        ok = datetime.strptime(mes, "%Y-%m").strftime("%Y-%m") == mes
+    except (TypeError, ValueError):
+        ok = False
+    if not ok:
+        raise ValueError(f"{mes!r}: mês inválido, use YYYY-MM")
+
+def _resumo_arquivado(meses=None):
+    """{dia: {vendas, entradas, saidas}} dos meses arquivados (todos, ou só `meses`)."""
+    query = ArquivoMes.query
+    if meses is not None:
+        query = query.filter(ArquivoMes.mes.in_(list(meses)))
+    dias = {}
+    for a in query.all():
+        try:
+            dias.update(json.loads(a.dias or "{}"))
+        except ValueError as e:
+            raise ValueError(f"{a.mes}: resumo arquivado corrompido ({e})") from e
+    return dias
+
+def _meses_arquivaveis():
+    mes_atual = hoje_str()[:7]
+    datas = {d for (d,) in db.session.query(Venda.data).distinct()}
+    datas |= {d for (d,) in db.session.query(Lancamento.data).distinct()}
+    abertos = {(c.data or "")[:7] for c in Caixa.query.filter_by(aberto=True).all()}
+    arquivados = {a.mes for a in ArquivoMes.query.all()}
+    meses = {(d or "")[:7] for d in datas if d}
+    return sorted(m for m in meses if m < mes_atual and m not in abertos and m not in arquivados)
+
+def arquivar_mes(mes: str):
+    """Move as vendas/lançamentos de `mes` (YYYY-MM) para o segmento comprimido."""
+    _valida_mes(mes)
+    if mes >= hoje_str()[:7]:
+        raise ValueError(f"{mes}: só meses encerrados podem ser arquivados")
+    if Caixa.query.filter(Caixa.data.like(f"{mes}-%"), Caixa.aberto.is_(True)).first():
+        raise ValueError(f"{mes}: existe caixa aberto no mês")
+    if ArquivoMes.query.filter_by(mes=mes).first() or ArquivoSegmento.query.filter_by(mes=mes).first():
+        raise ValueError(f"{mes}: mês já arquivado (restaure antes de arquivar de novo)")
+
+    vendas = Venda.query.filter(Venda.data.like(f"{mes}-%")).order_by(Venda.id).all()
+    lancs = Lancamento.query.filter(Lancamento.data.like(f"{mes}-%")).order_by(Lancamento.id).all()
+    if not vendas and not lancs:
+        return None
+
+    linhas, dias = [], {}
+    for v in vendas:
+        linhas.append({
+            "tabela": "venda", "id": v.id, "data": v.data, "forma_pagamento": v.forma_pagamento,
+            "observacoes": v.observacoes, "total": v.total, "itens": v.itens
+        })
+        dias.setdefault(v.data, dict(_ZERO))["vendas"] += v.total or 0.0
+    for l in lancs:
+        linhas.append({
+            "tabela": "lancamento", "id": l.id, "data": l.data, "tipo": l.tipo,
+            "descricao": l.descricao, "valor": l.valor
+        })
+        if l.tipo in ("entrada", "saida"):
+            dias.setdefault(l.data, dict(_ZERO))[l.tipo + "s"] += l.valor or 0.0
+
+    conteudo = "".join(json.dumps(l, ensure_ascii=False) + "\n" for l in linhas)
+    dados = gzip.compress(conteudo.encode("utf-8"), mtime=0)
+    resumo = ArquivoMes(
+        mes=mes, sha256=hashlib.sha256(dados).hexdigest(),
+        qtd_vendas=len(vendas), qtd_lancamentos=len(lancs),
+        total_vendas=sum(d["vendas"] for d in dias.values()),
+        total_entradas=sum(d["entradas"] for d in dias.values()),
+        total_saidas=sum(d["saidas"] for d in dias.values()),
+        dias=json.dumps(dias, sort_keys=True),
+        criado_em=datetime.now(TZ).strftime("%Y-%m-%d %H:%M:%S")
+    )
+    try:
+        db.session.add(ArquivoSegmento(mes=mes, dados=dados))
+        db.session.add(resumo)
+        if vendas:
+            Venda.query.filter(
+                Venda.data.like(f"{mes}-%"), Venda.id <= vendas[-1].id
+            ).delete(synchronize_session=False)
+        if lancs:
+            Lancamento.query.filter(
+                Lancamento.data.like(f"{mes}-%"), Lancamento.id <= lancs[-1].id
+            ).delete(synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise ValueError(f"{mes}: falha ao arquivar ({e})") from e
+    return resumo
+
+def restaurar_mes(mes: str):
+    """Devolve as linhas de um mês arquivado para Venda/Lancamento (com ids novos)."""
+    _valida_mes(mes)
+    a = ArquivoMes.query.filter_by(mes=mes).first()
+    seg = ArquivoSegmento.query.filter_by(mes=mes).first()
+    if not a or not seg:
+        raise ValueError(f"{mes}: mês não está arquivado")
+    if hashlib.sha256(seg.dados).hexdigest() != a.sha256:
+        raise ValueError(f"{mes}: segmento não confere com o checksum")
+
+    # Os ids antigos podem já ter sido reaproveitados (SQLite usa max(id)+1),
+    # então as linhas voltam com ids novos.
+    modelos = {"venda": Venda, "lancamento": Lancamento}
+    try:
+        registros = []
+        for linha in gzip.decompress(seg.dados).decode("utf-8").splitlines():
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            registro.pop("id", None)
+            registros.append(modelos[registro.pop("tabela")](**registro))
+    except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"{mes}: segmento corrompido ({e})") from e
+
+    try:
+        db.session.add_all(registros)
+        db.session.delete(seg)
+        db.session.delete(a)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise ValueError(f"{mes}: falha ao restaurar ({e})") from e
+    return len(registros)
+
+@app.cli.command("arquivar")
+@click.argument("meses", nargs=-1)
+def arquivar_cmd(meses):
+    """Arquiva meses encerrados (YYYY-MM). Sem argumentos: todos os elegíveis.
+
+    No Postgres, rodar VACUUM FULL venda, lancamento depois para liberar o espaço.
+    """
+    arquivou = False
+    for mes in (meses or _meses_arquivaveis()):
+        try:
+            resumo = arquivar_mes(mes)
+        except ValueError as e:
+            click.echo(f"IGNORADO {e}", err=True)
+            continue
+        if resumo is None:
+            click.echo(f"{mes}: nada a arquivar")
+        else:
+            arquivou = True
+            click.echo(f"{mes}: {resumo.qtd_vendas} vendas, {resumo.qtd_lancamentos} lançamentos arquivados")
+    if arquivou and db.engine.dialect.name == "postgresql":
+        click.echo("Lembrete: rode VACUUM FULL venda, lancamento; para o Postgres liberar o espaço.")
+
+@app.cli.command("restaurar")
+@click.argument("mes")
+def restaurar_cmd(mes):
+    """Reidrata um mês arquivado (YYYY-MM) nas tabelas vivas."""
+    try:
+        qtd = restaurar_mes(mes)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{mes}: {qtd} registros restaurados")
+
 # --------------- BOOT (executa também no Render) ---------------
 with app.app_context():
     ensure_schema()
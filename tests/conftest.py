@@ -0,0 +1,22 @@
+# tests/conftest.py — banco SQLite temporário para a sessão de testes
+# Dependências: pip install -r requirements-dev.txt
+
+import os
+import sys
+import shutil
+import tempfile
+
+_TMP = None
+
+
+def pytest_configure(config):
+    # Precisa rodar antes de qualquer `import app`: o app lê DATABASE_URL no import.
+    global _TMP
+    _TMP = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_TMP, "teste.db")
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def pytest_unconfigure(config):
+    if _TMP:
+        shutil.rmtree(_TMP, ignore_errors=True)
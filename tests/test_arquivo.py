@@ -0,0 +1,82 @@
+# tests/test_arquivo.py — ida e volta do arquivo morto (arquivar -> relatórios -> restaurar) em SQLite
+
+from datetime import date
+
+import pytest
+
+import app as hg
+from app import app, db, Venda, Lancamento, Caixa, ArquivoMes, ArquivoSegmento
+
+
+@pytest.fixture
+def ctx():
+    with app.app_context():
+        yield
+        db.session.remove()
+        for m in (Venda, Lancamento, Caixa, ArquivoMes, ArquivoSegmento):
+            m.query.delete()
+        db.session.commit()
+
+
+def _popula():
+    db.session.add_all([
+        Caixa(data="2025-03-05", saldo_inicial=10.0, aberto=False),
+        Caixa(data="2025-03-06", saldo_inicial=0.0, aberto=False),
+        Venda(data="2025-03-05", total=33.333, itens="[]"),
+        Venda(data="2025-03-06", total=50.005, itens="[]"),
+        Lancamento(data="2025-03-05", tipo="saida", descricao="frete", valor=20.0),
+        Lancamento(data="2025-03-06", tipo="entrada", descricao="troco", valor=5.0),
+    ])
+    db.session.commit()
+
+
+def test_ida_e_volta(ctx):
+    _popula()
+    antes = hg._coleta(date(2025, 3, 1), date(2025, 3, 31))
+
+    resumo = hg.arquivar_mes("2025-03")
+    assert resumo.qtd_vendas == 2 and resumo.qtd_lancamentos == 2
+    assert Venda.query.count() == 0 and Lancamento.query.count() == 0
+    assert hg._coleta(date(2025, 3, 1), date(2025, 3, 31)) == antes
+
+    # venda nova depois de arquivar pode reaproveitar o id antigo no SQLite
+    db.session.add(Venda(data="2025-04-01", total=1.0, itens="[]"))
+    db.session.commit()
+
+    assert hg.restaurar_mes("2025-03") == 4
+    assert Venda.query.count() == 3 and Lancamento.query.count() == 2
+    assert ArquivoMes.query.count() == 0 and ArquivoSegmento.query.count() == 0
+    assert hg._coleta(date(2025, 3, 1), date(2025, 3, 31)) == antes
+
+
+def test_coleta_com_mes_do_meio_arquivado(ctx):
+    db.session.add_all([
+        Venda(data="2025-01-10", total=10.0, itens="[]"),
+        Venda(data="2025-02-10", total=20.0, itens="[]"),
+        Venda(data="2025-03-10", total=30.0, itens="[]"),
+    ])
+    db.session.commit()
+    antes = hg._coleta(date(2025, 1, 1), date(2025, 3, 31))
+    assert antes[2] == 60.0
+
+    hg.arquivar_mes("2025-02")
+    assert hg._coleta(date(2025, 1, 1), date(2025, 3, 31)) == antes
+
+
+def test_resumo_corrompido_nao_some(ctx):
+    _popula()
+    hg.arquivar_mes("2025-03")
+    ArquivoMes.query.filter_by(mes="2025-03").first().dias = "{quebrado"
+    db.session.commit()
+    with pytest.raises(ValueError, match="2025-03"):
+        hg._resumo_arquivado()
+
+
+@pytest.mark.parametrize("mes", ["%", "2025-0_", "2025-3", "2025-13", ""])
+def test_mes_invalido(ctx, mes):
+    _popula()
+    with pytest.raises(ValueError):
+        hg.arquivar_mes(mes)
+    with pytest.raises(ValueError):
+        hg.restaurar_mes(mes)
+    assert Venda.query.count() == 2